@@ -22,7 +22,7 @@ from sbi.utils import (
     warn_on_invalid_x,
     warn_on_invalid_x_for_snpec_leakage,
 )
-from sbi.utils.sbiutils import get_simulations_since_round
+from sbi.utils.sbiutils import _get_simulations_since_round_without_copy
 from sbi.utils.torchutils import process_device
 
 
@@ -235,13 +235,15 @@ class NeuralInference(ABC):
         Returns: Parameters, simulation outputs, prior masks.
         """
 
-        theta = get_simulations_since_round(
+        # The data is copied when masking out invalid simulations below, so
+        # single-round data does not need to be concatenated into a copy first.
+        theta = _get_simulations_since_round_without_copy(
             self._theta_roundwise, self._data_round_index, starting_round
         )
-        x = get_simulations_since_round(
+        x = _get_simulations_since_round_without_copy(
             self._x_roundwise, self._data_round_index, starting_round
         )
-        prior_masks = get_simulations_since_round(
+        prior_masks = _get_simulations_since_round_without_copy(
             self._prior_masks, self._data_round_index, starting_round
         )
 
@@ -292,13 +294,17 @@ class NeuralInference(ABC):
         if epoch == 0 or self._val_log_prob > self._best_val_log_prob:
             self._best_val_log_prob = self._val_log_prob
             self._epochs_since_last_improvement = 0
-            self._best_model_state_dict = deepcopy(neural_net.state_dict())
+            if epoch == 0:
+                self._best_model_state_dict = deepcopy(neural_net.state_dict())
+            else:
+                # Reuse the buffers allocated in the first epoch to avoid reallocating.
+                for key, value in neural_net.state_dict().items():
+                    self._best_model_state_dict[key].copy_(value)
         else:
             self._epochs_since_last_improvement += 1
 
         # If no validation improvement over many epochs, stop training.
         if self._epochs_since_last_improvement > stop_after_epochs - 1:
-            neural_net.load_state_dict(self._best_model_state_dict)
             converged = True
 
         return converged
@@ -10,7 +10,6 @@ import torch
 from torch import Tensor, optim
 from torch.nn.utils import clip_grad_norm_
 from torch.utils import data
-from torch.utils.data.sampler import SubsetRandomSampler
 from torch.utils.tensorboard import SummaryWriter
 
 from sbi import utils as utils
@@ -176,26 +175,32 @@ class LikelihoodEstimator(NeuralInference, ABC):
             permuted_indices[num_training_examples:],
         )
 
-        # Dataset is shared for training and validation loaders.
-        dataset = data.TensorDataset(theta, x)
+        # Pinned host memory allows for asynchronous copies to the GPU.
+        pin_memory = self._device != "cpu" and theta.device.type == "cpu"
 
-        # Create neural net and validation loaders using a subset sampler.
+        # Gather the training and validation splits once, so that each loader reads
+        # from a contiguous dataset.
+        train_dataset = data.TensorDataset(theta[train_indices], x[train_indices])
+        val_dataset = data.TensorDataset(theta[val_indices], x[val_indices])
+
+        # Create neural net and validation loaders.
         train_loader = data.DataLoader(
-            dataset,
+            train_dataset,
             batch_size=min(training_batch_size, num_training_examples),
+            shuffle=True,
             drop_last=True,
-            sampler=SubsetRandomSampler(train_indices),
+            pin_memory=pin_memory,
         )
         val_loader = data.DataLoader(
-            dataset,
+            val_dataset,
             batch_size=min(training_batch_size, num_validation_examples),
             shuffle=False,
             drop_last=False,
-            sampler=SubsetRandomSampler(val_indices),
+            pin_memory=pin_memory,
         )
 
         self._neural_net.to(self._device)
-        optimizer = optim.Adam(list(self._neural_net.parameters()), lr=learning_rate,)
+        optimizer = optim.Adam(self._neural_net.parameters(), lr=learning_rate)
 
         epoch, self._val_log_prob = 0, float("-Inf")
         while epoch <= max_num_epochs and not self._converged(epoch, stop_after_epochs):
@@ -203,10 +208,12 @@ class LikelihoodEstimator(NeuralInference, ABC):
             # Train for a single epoch.
             self._neural_net.train()
             for batch in train_loader:
-                optimizer.zero_grad()
+                # Same as `zero_grad(set_to_none=True)`, which needs torch>=1.7.
+                for param in self._neural_net.parameters():
+                    param.grad = None
                 theta_batch, x_batch = (
-                    batch[0].to(self._device),
-                    batch[1].to(self._device),
+                    batch[0].to(self._device, non_blocking=True),
+                    batch[1].to(self._device, non_blocking=True),
                 )
                 # Evaluate on x with theta as context.
                 log_prob = self._neural_net.log_prob(x_batch, context=theta_batch)
@@ -222,17 +229,18 @@ class LikelihoodEstimator(NeuralInference, ABC):
 
             # Calculate validation performance.
             self._neural_net.eval()
-            log_prob_sum = 0
+            # Accumulate on the device and sync once per epoch instead of per batch.
+            log_prob_sum = torch.zeros((), device=self._device)
             with torch.no_grad():
                 for batch in val_loader:
                     theta_batch, x_batch = (
-                        batch[0].to(self._device),
-                        batch[1].to(self._device),
+                        batch[0].to(self._device, non_blocking=True),
+                        batch[1].to(self._device, non_blocking=True),
                     )
                     # Evaluate on x with theta as context.
                     log_prob = self._neural_net.log_prob(x_batch, context=theta_batch)
-                    log_prob_sum += log_prob.sum().item()
-            self._val_log_prob = log_prob_sum / num_validation_examples
+                    log_prob_sum += log_prob.sum()
+            self._val_log_prob = log_prob_sum.item() / num_validation_examples
             # Log validation log prob for every epoch.
             self._summary["validation_log_probs"].append(self._val_log_prob)
 
@@ -240,6 +248,9 @@ class LikelihoodEstimator(NeuralInference, ABC):
 
         self._report_convergence_at_end(epoch, stop_after_epochs, max_num_epochs)
 
+        # Restore the best state, also when stopping at `max_num_epochs`.
+        self._neural_net.load_state_dict(self._best_model_state_dict)
+
         # Update summary.
         self._summary["epochs"].append(epoch)
         self._summary["best_validation_log_probs"].append(self._best_val_log_prob)
@@ -11,7 +11,6 @@ import torch
 from torch import Tensor, ones, optim
 from torch.nn.utils import clip_grad_norm_
 from torch.utils import data
-from torch.utils.data.sampler import SubsetRandomSampler
 from torch.utils.tensorboard import SummaryWriter
 
 from sbi import utils as utils
@@ -224,27 +223,42 @@ class PosteriorEstimator(NeuralInference, ABC):
             permuted_indices[num_training_examples:],
         )
 
-        # Dataset is shared for training and validation loaders.
-        dataset = data.TensorDataset(theta, x, prior_masks,)
+        # Pinned host memory allows for asynchronous copies to the GPU.
+        pin_memory = self._device != "cpu" and theta.device.type == "cpu"
 
-        # Create neural net and validation loaders using a subset sampler.
+        # Gather the training and validation splits once, so that each loader reads
+        # from a contiguous dataset.
+        train_dataset = data.TensorDataset(
+            theta[train_indices], x[train_indices], prior_masks[train_indices],
+        )
+        val_dataset = data.TensorDataset(
+            theta[val_indices], x[val_indices], prior_masks[val_indices],
+        )
+
+        # Create neural net and validation loaders.
         train_loader = data.DataLoader(
-            dataset,
+            train_dataset,
             batch_size=min(training_batch_size, num_training_examples),
+            shuffle=True,
             drop_last=True,
-            sampler=SubsetRandomSampler(train_indices),
+            pin_memory=pin_memory,
         )
+        val_batch_size = min(training_batch_size, num_validation_examples)
         val_loader = data.DataLoader(
-            dataset,
-            batch_size=min(training_batch_size, num_validation_examples),
+            val_dataset,
+            batch_size=val_batch_size,
             shuffle=False,
             drop_last=True,
-            sampler=SubsetRandomSampler(val_indices),
+            pin_memory=pin_memory,
         )
+        # Atomic losses compare samples within a batch and therefore need complete
+        # batches, so the last incomplete validation batch is dropped. Normalize by
+        # the number of samples that are actually evaluated.
+        num_evaluated_validation_examples = len(val_loader) * val_batch_size
 
         # Move entire net to device for training.
         self._neural_net.to(self._device)
-        optimizer = optim.Adam(list(self._neural_net.parameters()), lr=learning_rate,)
+        optimizer = optim.Adam(self._neural_net.parameters(), lr=learning_rate)
 
         epoch, self._val_log_prob = 0, float("-Inf")
         while epoch <= max_num_epochs and not self._converged(epoch, stop_after_epochs):
@@ -252,12 +266,14 @@ class PosteriorEstimator(NeuralInference, ABC):
             # Train for a single epoch.
             self._neural_net.train()
             for batch in train_loader:
-                optimizer.zero_grad()
+                # Same as `zero_grad(set_to_none=True)`, which needs torch>=1.7.
+                for param in self._neural_net.parameters():
+                    param.grad = None
                 # Get batches on current device.
                 theta_batch, x_batch, masks_batch = (
-                    batch[0].to(self._device),
-                    batch[1].to(self._device),
-                    batch[2].to(self._device),
+                    batch[0].to(self._device, non_blocking=True),
+                    batch[1].to(self._device, non_blocking=True),
+                    batch[2].to(self._device, non_blocking=True),
                 )
 
                 batch_loss = torch.mean(
@@ -276,21 +292,24 @@ class PosteriorEstimator(NeuralInference, ABC):
 
             # Calculate validation performance.
             self._neural_net.eval()
-            log_prob_sum = 0
+            # Accumulate on the device and sync once per epoch instead of per batch.
+            log_prob_sum = torch.zeros((), device=self._device)
             with torch.no_grad():
                 for batch in val_loader:
                     theta_batch, x_batch, masks_batch = (
-                        batch[0].to(self._device),
-                        batch[1].to(self._device),
-                        batch[2].to(self._device),
+                        batch[0].to(self._device, non_blocking=True),
+                        batch[1].to(self._device, non_blocking=True),
+                        batch[2].to(self._device, non_blocking=True),
                     )
                     # Take negative loss here to get validation log_prob.
                     batch_log_prob = -self._loss(
                         theta_batch, x_batch, masks_batch, proposal, calibration_kernel,
                     )
-                    log_prob_sum += batch_log_prob.sum().item()
+                    log_prob_sum += batch_log_prob.sum()
 
-            self._val_log_prob = log_prob_sum / num_validation_examples
+            self._val_log_prob = (
+                log_prob_sum.item() / num_evaluated_validation_examples
+            )
             # Log validation log prob for every epoch.
             self._summary["validation_log_probs"].append(self._val_log_prob)
 
@@ -298,6 +317,9 @@ class PosteriorEstimator(NeuralInference, ABC):
 
         self._report_convergence_at_end(epoch, stop_after_epochs, max_num_epochs)
 
+        # Restore the best state, also when stopping at `max_num_epochs`.
+        self._neural_net.load_state_dict(self._best_model_state_dict)
+
         # Update summary.
         self._summary["epochs"].append(epoch)
         self._summary["best_validation_log_probs"].append(self._best_val_log_prob)
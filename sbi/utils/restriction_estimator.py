@@ -7,8 +7,6 @@ import torch.nn.functional as F
 from pyknos.nflows.nn import nets
 from torch import Tensor, nn, optim, relu
 from torch.nn.utils import clip_grad_norm_
-from torch.utils import data
-from torch.utils.data.sampler import SubsetRandomSampler, WeightedRandomSampler
 from tqdm.auto import tqdm
 
 from sbi.types import Shape
@@ -250,6 +248,7 @@ class RestrictionEstimator:
         clip_max_norm: Optional[float] = 5.0,
         loss_importance_weights: Union[bool, float] = False,
         subsample_invalid_sims: Union[float, str] = 1.0,
+        show_progress_bars: bool = True,
     ) -> torch.nn.Module:
         r"""
         Train the classifier to distinguish parameters with `valid`|`invalid` outputs.
@@ -276,6 +275,7 @@ class RestrictionEstimator:
                 one wants to train on a larger fraction of valid simulations. This
                 factor has to be in [0, 1]. If it is `auto`, automatically infer
                 subsample weights such that the data is balanced.
+            show_progress_bars: Whether to print the number of epochs trained so far.
         """
 
         theta = torch.cat(self._theta_roundwise)
@@ -305,27 +305,10 @@ class RestrictionEstimator:
         subsample_weights = deepcopy(subsample_weights)
         subsample_weights[val_indices] = 0.0
 
-        # Dataset is shared for training and validation loaders.
-        dataset = data.TensorDataset(theta, label)
-
-        # Create neural_net and validation loaders using a subset sampler.
-        train_loader = data.DataLoader(
-            dataset,
-            batch_size=training_batch_size,
-            drop_last=True,
-            sampler=WeightedRandomSampler(
-                subsample_weights, int(subsample_weights.sum()), replacement=False
-            ),
-        )
-        val_loader = data.DataLoader(
-            dataset,
-            batch_size=min(
-                max(200, training_batch_size), num_examples - num_training_examples
-            ),
-            shuffle=False,
-            drop_last=True,
-            sampler=SubsetRandomSampler(val_indices),
-        )
+        # The data is held in memory in full, so batches are sliced from it directly
+        # instead of going through a `DataLoader` with its per-sample collation.
+        num_train_samples = int(subsample_weights.sum())
+        theta_val, label_val = theta[val_indices], label[val_indices]
 
         if self._classifier is None:
             self._classifier = self._build_nn(theta[train_indices])
@@ -336,7 +319,7 @@ class RestrictionEstimator:
             self._first_round_validation_theta = theta[val_indices]
             self._first_round_validation_label = label[val_indices]
 
-        optimizer = optim.Adam(list(self._classifier.parameters()), lr=learning_rate,)
+        optimizer = optim.Adam(self._classifier.parameters(), lr=learning_rate)
         max_num_epochs = 2 ** 31 - 1 if max_num_epochs is None else max_num_epochs
 
         # Compute the fraction of good simulations in dataset.
@@ -359,8 +342,18 @@ class RestrictionEstimator:
         epoch, self._val_log_prob = 0, float("-Inf")
         while epoch <= max_num_epochs and not self._converged(epoch, stop_after_epochs):
             self._classifier.train()
-            for parameters, observations in train_loader:
-                optimizer.zero_grad()
+            # Weighted draw without replacement, identical to a `WeightedRandomSampler`.
+            train_perm = torch.multinomial(
+                subsample_weights, num_train_samples, replacement=False
+            )
+            for start in range(
+                0, num_train_samples - training_batch_size + 1, training_batch_size
+            ):
+                batch_indices = train_perm[start : start + training_batch_size]
+                parameters, observations = theta[batch_indices], label[batch_indices]
+                # Same as `zero_grad(set_to_none=True)`, which needs torch>=1.7.
+                for param in self._classifier.parameters():
+                    param.grad = None
                 outputs = self._classifier(parameters)
                 loss = criterion(outputs, observations).mean()
                 loss.backward()
@@ -375,17 +368,24 @@ class RestrictionEstimator:
             # calculate validation performance
             self._classifier.eval()
 
-            val_loss = 0.0
-            with torch.no_grad():
-                for parameters, observations in val_loader:
-                    outputs = self._classifier(parameters)
-                    loss = criterion(outputs, observations)
-                    loss[~observations.bool()] *= subsample_invalid_sims
-                    val_loss += loss.sum().item()
-            self._val_log_prob = -val_loss / num_validation_examples
+            # The validation set is small, so it is evaluated in a single forward pass.
+            # `inference_mode` also skips view and version-counter tracking. It is
+            # only available for torch>=1.9, fall back to `no_grad` otherwise.
+            with getattr(torch, "inference_mode", torch.no_grad)():
+                outputs = self._classifier(theta_val)
+                loss = criterion(outputs, label_val)
+                loss[~label_val.bool()] *= subsample_invalid_sims
+                val_loss = loss.sum()
+            self._val_log_prob = -val_loss.item() / num_validation_examples
             self._validation_log_probs.append(self._val_log_prob)
 
-            print("Training neural network. Epochs trained: ", epoch, end="\r")
+            if show_progress_bars:
+                print("Training neural network. Epochs trained: ", epoch, end="\r")
+
+        # The loop exits on `max_num_epochs` before `_converged` sees the last epoch,
+        # so let it take that epoch into account before restoring the best state.
+        self._converged(epoch, stop_after_epochs)
+        self._classifier.load_state_dict(self._best_model_state_dict)
 
         return deepcopy(self._classifier)
 
@@ -456,13 +456,17 @@ class RestrictionEstimator:
         if epoch == 0 or self._val_log_prob > self._best_val_log_prob:
             self._best_val_log_prob = self._val_log_prob
             self._epochs_since_last_improvement = 0
-            self._best_model_state_dict = deepcopy(posterior_nn.state_dict())
+            if epoch == 0:
+                self._best_model_state_dict = deepcopy(posterior_nn.state_dict())
+            else:
+                # Reuse the buffers allocated in the first epoch to avoid reallocating.
+                for key, value in posterior_nn.state_dict().items():
+                    self._best_model_state_dict[key].copy_(value)
         else:
             self._epochs_since_last_improvement += 1
 
         # If no validation improvement over many epochs, stop training.
         if self._epochs_since_last_improvement > stop_after_epochs - 1:
-            posterior_nn.load_state_dict(self._best_model_state_dict)
             converged = True
 
         return converged
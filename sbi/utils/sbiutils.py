@@ -57,8 +57,8 @@ def standardizing_transform(
 
     is_valid_t, *_ = handle_invalid_x(batch_t, True)
 
-    t_mean = torch.mean(batch_t[is_valid_t], dim=0)
-    t_std = torch.std(batch_t[is_valid_t], dim=0)
+    # Mask once and compute both moments in a single pass.
+    t_std, t_mean = torch.std_mean(batch_t[is_valid_t], dim=0)
     t_std[t_std < min_std] = min_std
 
     return transforms.AffineTransform(shift=-t_mean / t_std, scale=1 / t_std)
@@ -91,13 +91,15 @@ def standardizing_net(batch_t: Tensor, min_std: float = 1e-7) -> nn.Module:
     """
 
     is_valid_t, *_ = handle_invalid_x(batch_t, True)
+    valid_t = batch_t[is_valid_t]
 
-    t_mean = torch.mean(batch_t[is_valid_t], dim=0)
-    if len(batch_t > 1):
-        t_std = torch.std(batch_t[is_valid_t], dim=0)
+    if len(valid_t) > 1:
+        # Compute both moments in a single pass.
+        t_std, t_mean = torch.std_mean(valid_t, dim=0)
         t_std[t_std < min_std] = min_std
     else:
-        t_std = 1
+        t_mean = torch.mean(valid_t, dim=0)
+        t_std = torch.ones_like(t_mean)
         logging.warning(
             f"""Using a one-dimensional batch will instantiate a Standardize transform 
             with (mean, std) parameters which are not representative of the data. We allow
@@ -321,6 +323,21 @@ def get_simulations_since_round(
     )
 
 
+def _get_simulations_since_round_without_copy(
+    data: List, data_round_indices: List, starting_round_index: int
+) -> Tensor:
+    """
+    Like `get_simulations_since_round`, but without copying data from a single round.
+
+    The returned tensor may be the stored tensor itself. Only use it where the result
+    is copied or read-only afterwards, e.g. before masking out invalid simulations.
+    """
+    selected = [
+        t for t, r in zip(data, data_round_indices) if r >= starting_round_index
+    ]
+    return selected[0] if len(selected) == 1 else torch.cat(selected)
+
+
 def mask_sims_from_prior(round_: int, num_simulations: int) -> Tensor:
     """Returns Tensor True where simulated from prior parameters.
 
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import pytest
+import torch
 from torch import eye, ones, zeros
 from torch.distributions import MultivariateNormal
 
@@ -46,6 +47,29 @@ def test_api_snl_on_linearGaussian(num_dim: int, set_seed):
     posterior.sample(sample_shape=(num_samples,), x=x_o, mcmc_parameters={"thin": 3})
 
 
+def test_snl_restores_best_state_at_max_num_epochs(set_seed):
+    """Test that training stopped by `max_num_epochs` returns the best network.
+
+    Args:
+        set_seed: fixture for manual seeding
+    """
+    num_dim = 2
+    prior = MultivariateNormal(loc=zeros(num_dim), covariance_matrix=eye(num_dim))
+
+    simulator, prior = prepare_for_sbi(diagonal_linear_gaussian, prior)
+    inference = SNL(prior, show_progress_bars=False,)
+
+    theta, x = simulate_for_sbi(simulator, prior, 500, simulation_batch_size=50)
+    # A large learning rate makes it likely that the last epoch is not the best one.
+    density_estimator = inference.append_simulations(theta, x).train(
+        max_num_epochs=3, learning_rate=1e-1
+    )
+
+    best_state_dict = inference._best_model_state_dict
+    for key, value in density_estimator.state_dict().items():
+        assert torch.equal(value, best_state_dict[key])
+
+
 def test_c2st_snl_on_linearGaussian_different_dims(set_seed):
     """Test whether SNL infers well a simple example with available ground truth.
 
@@ -163,6 +163,34 @@ def test_c2st_snpe_on_linearGaussian_different_dims(set_seed):
     check_c2st(samples, target_samples, alg="snpe_c")
 
 
+def test_snpe_validation_log_prob_with_incomplete_validation_batch(set_seed):
+    """Test that the validation log prob is the mean over the evaluated samples.
+
+    The validation set (11 samples) is not a multiple of the batch size (5), so the
+    last incomplete batch is dropped. All simulations are identical, such that the
+    mean log prob over the evaluated samples equals the log prob of any single one.
+
+    Args:
+        set_seed: fixture for manual seeding
+    """
+    num_dim = 2
+    prior = MultivariateNormal(loc=zeros(num_dim), covariance_matrix=eye(num_dim))
+
+    theta = 0.5 * ones(101, num_dim)
+    x = theta - 1.0
+
+    inference = SNPE_C(prior, show_progress_bars=False)
+    density_estimator = inference.append_simulations(theta, x).train(
+        training_batch_size=5, validation_fraction=0.1, max_num_epochs=2
+    )
+    density_estimator.eval()
+
+    with torch.no_grad():
+        log_prob = density_estimator.log_prob(theta[:1], x[:1]).item()
+
+    assert inference._best_val_log_prob == pytest.approx(log_prob, rel=1e-4)
+
+
 # Test multi-round SNPE.
 @pytest.mark.slow
 @pytest.mark.parametrize(
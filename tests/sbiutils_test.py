@@ -10,6 +10,7 @@ from sbi.utils import (
     conditional_corrcoeff,
     conditional_pairplot,
 )
+from sbi.utils.sbiutils import standardizing_net
 
 
 def test_conditional_density_1d():
@@ -191,3 +192,18 @@ def test_average_cond_coeff_matrix():
     )
 
     assert (torch.abs(gt_matrix - cond_mat) < 1e-3).all()
+
+
+def test_standardizing_net_from_single_row_loads_state_dict():
+    """Test that a z-scoring net built from a single row can load trained statistics.
+
+    This is the intended use of the single-row fallback, e.g. when loading a
+    pre-trained network.
+    """
+    net = standardizing_net(torch.randn(1, 3))
+    trained_net = standardizing_net(torch.randn(100, 3))
+
+    net.load_state_dict(trained_net.state_dict())
+
+    assert torch.allclose(net._mean, trained_net._mean)
+    assert torch.allclose(net._std, trained_net._std)